@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import config, forecast, runs
+from app.services.admission import admission_controller
 
 app = FastAPI(
     title="Forecast Dashboard API",
@@ -15,6 +16,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],  # Lets the dashboard honour load-shedding backoff
 )
 
 # Include routers
@@ -32,3 +34,9 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+
+@app.get("/admission")
+async def admission():
+    """Admission control state: active/queued requests, queue waits and rejections."""
+    return admission_controller.stats()
+
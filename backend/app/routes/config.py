@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.services.artifacts import ArtifactService
 
 router = APIRouter()
@@ -15,7 +16,8 @@ async def get_config():
             "models": ["arima", "seq2seq_attention_quantile"],
             "horizons": [1, 7, 14, 30],
             "quantiles": [0.1, 0.5, 0.9],
-            "folds_available": artifact_service.get_available_folds()
+            # Scanning reports parses every run, so keep it off the event loop
+            "folds_available": await run_in_threadpool(artifact_service.get_available_folds)
         }
         return config_data
     except Exception as e:
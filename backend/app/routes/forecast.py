@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List
 from app.services.forecasting import ForecastingService
+from app.services.admission import admission_controller
 
 router = APIRouter()
 forecasting_service = ForecastingService()
@@ -26,14 +28,17 @@ async def get_series():
         raise HTTPException(status_code=500, detail=f"Error loading series: {str(e)}")
 
 
-@router.post("/query")
+@router.post("/query", dependencies=[Depends(admission_controller.limit("query"))])
 async def query_forecast(query: ForecastQuery):
     """
     Query forecast data with specified model, horizon, and fold.
     Returns historical data, forecast with quantiles, and metrics.
+    Subject to admission control: 429/503 with Retry-After when saturated.
     """
     try:
-        result = forecasting_service.get_forecast(
+        # Parse off the event loop so SSE streams and cheap endpoints stay responsive
+        result = await run_in_threadpool(
+            forecasting_service.get_forecast,
             model=query.model,
             horizon=query.horizon,
             fold_id=query.fold_id,
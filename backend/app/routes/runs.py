@@ -1,13 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 from app.services.runs import RunService
+from app.services.admission import admission_controller, AdmissionRejected
 import asyncio
 import json
 
 router = APIRouter()
-run_service = RunService()
+run_service = RunService(run_gate=admission_controller.gate("runs"))
 
 
 class RunStartRequest(BaseModel):
@@ -16,11 +17,11 @@ class RunStartRequest(BaseModel):
     fold_id: Optional[int] = None
 
 
-@router.post("/start")
+@router.post("/start", dependencies=[Depends(admission_controller.rate_limit("runs"))])
 async def start_run(request: RunStartRequest):
     """
     Start a background evaluation run.
-    Returns run_id for tracking.
+    Returns run_id for tracking, or 429/503 with Retry-After when saturated.
     """
     try:
         run_id = run_service.start_run(
@@ -29,6 +30,8 @@ async def start_run(request: RunStartRequest):
             fold_id=request.fold_id
         )
         return {"run_id": run_id, "status": "queued"}
+    except AdmissionRejected as e:
+        raise e.to_http()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting run: {str(e)}")
 
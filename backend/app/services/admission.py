@@ -0,0 +1,320 @@
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, Deque, Optional
+from fastapi import HTTPException, Request
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request cannot be admitted.
+    Carries the HTTP status (429 or 503) and a Retry-After hint in seconds.
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(
+            status_code=self.status_code,
+            detail=self.detail,
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` stored."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """
+        Take one token. Returns 0 on success, otherwise the number of
+        seconds until a token becomes available.
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class AdmissionTicket:
+    """A claim on a gate slot, resolved once the holder may proceed."""
+
+    def __init__(self):
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+        self.admitted_at: Optional[float] = None
+
+
+class AdmissionGate:
+    """
+    Concurrency cap with a bounded FIFO wait queue for one endpoint class.
+    Requests beyond `max_concurrent` wait in line; once `max_queue` are
+    waiting, or a waiter exceeds `queue_timeout` (0 waits indefinitely),
+    the request is shed with 503. `service_time` is the expected time a slot
+    is held, used for Retry-After until a request has been observed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        rate: float,
+        burst: float,
+        service_time: float = 1.0,
+        max_clients: int = 10000
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst
+        self.service_time = service_time
+        self.max_clients = max_clients
+
+        self.active = 0
+        self._waiters: Deque[AdmissionTicket] = deque()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+        # Counters exposed via stats()
+        self.admitted = 0
+        self.waited = 0
+        self.rejected_rate_limited = 0
+        self.rejected_queue_full = 0
+        self.rejected_queue_timeout = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service_time: Optional[float] = None
+
+    def _retry_after(self) -> int:
+        """Estimate how long until the current backlog drains."""
+        backlog = (len(self._waiters) + 1) / max(self.max_concurrent, 1)
+        service_time = self.avg_service_time if self.avg_service_time is not None else self.service_time
+        return max(1, math.ceil(backlog * service_time))
+
+    def check_rate(self, client: str):
+        """Charge one token to the client's bucket; raise 429 when empty."""
+        if self.rate <= 0:
+            return
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._prune_buckets()
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+        wait = bucket.take()
+        if wait > 0:
+            self.rejected_rate_limited += 1
+            raise AdmissionRejected(
+                429,
+                f"Rate limit exceeded for {self.name} requests",
+                max(1, math.ceil(wait))
+            )
+
+    def _prune_buckets(self):
+        # A full bucket carries no state beyond a fresh one, so it can go.
+        now = time.monotonic()
+        for client in [c for c, b in self._buckets.items() if b.is_full(now)]:
+            del self._buckets[client]
+
+    def submit(self) -> AdmissionTicket:
+        """
+        Synchronously claim a slot or a place in the queue.
+        The returned ticket resolves once the caller holds a slot; the
+        holder must call release() when done. Raises 503 if the queue is full.
+        """
+        ticket = AdmissionTicket()
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._admit(ticket)
+        elif len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(
+                503,
+                f"Too many {self.name} requests in progress",
+                self._retry_after()
+            )
+        else:
+            self._waiters.append(ticket)
+        return ticket
+
+    def _record_wait(self, ticket: AdmissionTicket, now: float):
+        wait = now - ticket.enqueued_at
+        self.waited += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _admit(self, ticket: AdmissionTicket):
+        now = time.monotonic()
+        self._record_wait(ticket, now)
+        self.admitted += 1
+        ticket.admitted_at = now
+        ticket.future.set_result(None)
+
+    async def wait(self, ticket: AdmissionTicket):
+        """Wait for a ticket from submit(); raise 503 if it times out in the queue."""
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), self.queue_timeout or None)
+        except asyncio.CancelledError:
+            if ticket.future.done():
+                # The slot was handed over as we gave up; pass it on.
+                self.release(ticket)
+            else:
+                self._abandon(ticket)
+            raise
+        except asyncio.TimeoutError:
+            if ticket.future.done():
+                return
+            self._abandon(ticket)
+            # Shed requests waited too; leaving them out hides overload
+            self._record_wait(ticket, time.monotonic())
+            self.rejected_queue_timeout += 1
+            raise AdmissionRejected(
+                503,
+                f"Timed out waiting for a {self.name} slot",
+                self._retry_after()
+            )
+
+    def _abandon(self, ticket: AdmissionTicket):
+        ticket.future.cancel()
+        self._waiters.remove(ticket)
+
+    def release(self, ticket: AdmissionTicket):
+        """Give up a held slot, handing it to the next waiter if any."""
+        held = time.monotonic() - ticket.admitted_at
+        if self.avg_service_time is None:
+            self.avg_service_time = held
+        else:
+            self.avg_service_time = 0.8 * self.avg_service_time + 0.2 * held
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.future.done():
+                self._admit(waiter)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": {
+                "rate_limited": self.rejected_rate_limited,
+                "queue_full": self.rejected_queue_full,
+                "queue_timeout": self.rejected_queue_timeout
+            },
+            "queue_wait_avg_s": self.total_wait / self.waited if self.waited else 0.0,
+            "queue_wait_max_s": self.max_wait,
+            "service_time_avg_s": self.avg_service_time if self.avg_service_time is not None else self.service_time
+        }
+
+
+class AdmissionController:
+    """
+    Admission control for expensive endpoint classes.
+    Cheap endpoints (/health, run status and SSE streams) are never gated,
+    so they stay responsive while heavy work is queued or shed. /config is
+    not gated either; its reports scan runs in the threadpool and is cached.
+
+    Each class is configured via FORECAST_ADMISSION_<CLASS>_* environment
+    variables: MAX_CONCURRENT, MAX_QUEUE, QUEUE_TIMEOUT (seconds, 0 waits
+    indefinitely), and the per-client token bucket RATE (requests/second,
+    0 disables) and BURST. SERVICE_TIME (seconds) seeds the Retry-After
+    estimate until real service times have been observed.
+    """
+
+    DEFAULTS = {
+        "query": {"max_concurrent": 4, "max_queue": 16, "queue_timeout": 5.0, "rate": 5.0, "burst": 10, "service_time": 1.0},
+        "runs": {"max_concurrent": 2, "max_queue": 8, "queue_timeout": 0.0, "rate": 0.5, "burst": 3, "service_time": 5.5},
+    }
+
+    def __init__(self):
+        self.gates: Dict[str, AdmissionGate] = {}
+        for name, defaults in self.DEFAULTS.items():
+            prefix = f"FORECAST_ADMISSION_{name.upper()}_"
+            self.gates[name] = AdmissionGate(
+                name=name,
+                max_concurrent=_env_int(prefix + "MAX_CONCURRENT", defaults["max_concurrent"]),
+                max_queue=_env_int(prefix + "MAX_QUEUE", defaults["max_queue"]),
+                queue_timeout=_env_float(prefix + "QUEUE_TIMEOUT", defaults["queue_timeout"]),
+                rate=_env_float(prefix + "RATE", defaults["rate"]),
+                burst=_env_float(prefix + "BURST", defaults["burst"]),
+                service_time=_env_float(prefix + "SERVICE_TIME", defaults["service_time"])
+            )
+
+    def gate(self, name: str) -> AdmissionGate:
+        return self.gates[name]
+
+    def rate_limit(self, name: str):
+        """FastAPI dependency applying only the per-client rate limit of a class."""
+        gate = self.gates[name]
+
+        async def dependency(request: Request):
+            try:
+                gate.check_rate(_client_id(request))
+            except AdmissionRejected as e:
+                raise e.to_http()
+
+        return dependency
+
+    def limit(self, name: str):
+        """
+        FastAPI dependency applying the rate limit and holding a concurrency
+        slot of the class for the duration of the request.
+        """
+        gate = self.gates[name]
+
+        async def dependency(request: Request):
+            try:
+                gate.check_rate(_client_id(request))
+                ticket = gate.submit()
+                await gate.wait(ticket)
+            except AdmissionRejected as e:
+                raise e.to_http()
+            try:
+                yield
+            finally:
+                gate.release(ticket)
+
+        return dependency
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: gate.stats() for name, gate in self.gates.items()}
+
+
+def _client_id(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+admission_controller = AdmissionController()
@@ -2,77 +2,133 @@ import os
 import json
 import csv
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import glob
+from app.services.compression import (
+    RunSource, artifact_names, open_text, is_run_archive, iter_runs, find_run
+)
+
+# Artifacts read when collecting available folds
+FOLD_ARTIFACTS = ["folds.json", "predictions.csv"]
 
 class ArtifactService:
     """
     Service for loading artifacts produced by timeseries-forecaster.
-    Assumes artifacts are in reports/<run_id>/ structure.
+    Assumes artifacts are in reports/<run_id>/ structure, or packed into a
+    reports/<run_id>.tar[.gz|.zst] / .zip archive. Individual artifacts may be
+    gzip or zstd compressed (e.g. predictions.csv.gz, predictions.csv.zst).
     """
     
     def __init__(self, reports_dir: str = None):
         self.reports_dir = Path(reports_dir or os.getenv("FORECAST_REPORTS_DIR", "./reports"))
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # (source files signature, folds) from the last reports scan
+        self._folds_cache = None
     
     def get_available_folds(self) -> List[int]:
         """
         Scan reports directory for available fold IDs.
-        Returns list of fold IDs found in reports.
+        Returns list of fold IDs found in reports. The scan is cached until
+        one of the files it reads changes size or mtime, or files are added
+        or removed.
         """
-        folds = set()
+        sources = self._fold_sources()
+        signature = self._fold_signature(sources)
+        cached = self._folds_cache
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
         
-        # Look for folds.json files
-        for folds_file in self.reports_dir.rglob("folds.json"):
+        folds = self._scan_folds(sources)
+        self._folds_cache = (signature, folds)
+        return list(folds)
+    
+    def _fold_sources(self) -> List[Tuple[Path, Optional[str]]]:
+        """
+        Files the fold scan reads, as (path, artifact name) pairs, found at any
+        depth under the reports directory. Run archives have no artifact name;
+        their members are found while reading.
+        """
+        artifact_files = {
+            candidate: name for name in FOLD_ARTIFACTS for candidate in artifact_names(name)
+        }
+        sources = []
+        for path in self.reports_dir.rglob("*"):
+            if is_run_archive(path):
+                sources.append((path, None))
+            elif path.name in artifact_files and path.is_file():
+                sources.append((path, artifact_files[path.name]))
+        return sources
+    
+    def _fold_signature(self, sources: List[Tuple[Path, Optional[str]]]) -> List[Tuple[str, int, int]]:
+        # Runs are written incrementally, so key on each file's own stat rather
+        # than the run directory's mtime, which ignores in-place writes.
+        signature = []
+        for path, _ in sources:
             try:
-                with open(folds_file, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'folds' in data:
-                        for fold_data in data['folds']:
-                            if 'fold' in fold_data:
-                                folds.add(fold_data['fold'])
-                    elif isinstance(data, list):
-                        for item in data:
-                            if isinstance(item, dict) and 'fold' in item:
-                                folds.add(item['fold'])
-            except:
+                stat = path.stat()
+            except OSError:
                 continue
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return sorted(signature)
+    
+    def _scan_folds(self, sources: List[Tuple[Path, Optional[str]]]) -> List[int]:
+        folds = set()
         
-        # Also check predictions.csv for fold information
-        for pred_file in self.reports_dir.rglob("predictions.csv"):
+        for path, name in sources:
             try:
-                with open(pred_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if 'fold' in row:
-                            folds.add(int(row['fold']))
+                if name is None:
+                    # Read folds.json and predictions.csv in a single pass per archive
+                    for member_name, f in RunSource(path).iter_artifacts(FOLD_ARTIFACTS):
+                        self._collect_folds(member_name, f, folds)
+                else:
+                    with open_text(path) as f:
+                        self._collect_folds(name, f, folds)
             except:
                 continue
         
         return sorted(list(folds)) if folds else [0, 1, 2, 3, 4]  # Default folds
     
+    def _collect_folds(self, name: str, f, folds: set):
+        """Add fold IDs found in a folds.json or predictions.csv stream."""
+        try:
+            if name == "folds.json":
+                data = json.load(f)
+                if isinstance(data, dict) and 'folds' in data:
+                    for fold_data in data['folds']:
+                        if 'fold' in fold_data:
+                            folds.add(fold_data['fold'])
+                elif isinstance(data, list):
+                    for item in data:
+                        if isinstance(item, dict) and 'fold' in item:
+                            folds.add(item['fold'])
+            else:
+                # Also check predictions.csv for fold information
+                reader = csv.DictReader(f)
+                for row in reader:
+                    if 'fold' in row:
+                        folds.add(int(row['fold']))
+        except:
+            pass
+    
     def load_report(self, run_id: str = None, fold_id: int = None) -> Dict[str, Any]:
         """
         Load a report file. If run_id is provided, load from that run's directory.
         Otherwise, load the latest report.
         """
         if run_id:
-            report_path = self.reports_dir / run_id / "report.json"
+            run = find_run(self.reports_dir, run_id)
+            runs = [run] if run is not None else []
         else:
-            # Find latest report
-            report_files = list(self.reports_dir.rglob("report.json"))
-            if not report_files:
-                return {}
-            report_path = max(report_files, key=lambda p: p.stat().st_mtime)
-        
-        if not report_path.exists():
-            return {}
+            # Newest run first; fall back to older runs without a report.json
+            runs = sorted(iter_runs(self.reports_dir), key=lambda r: r.mtime, reverse=True)
         
-        try:
-            with open(report_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            return {}
+        for run in runs:
+            try:
+                with run.open("report.json") as f:
+                    return json.load(f)
+            except Exception as e:
+                continue
+        return {}
     
     def load_forecast_data(self, model: str, horizon: int, fold_id: int = None) -> Dict[str, Any]:
         """
@@ -81,107 +137,116 @@ class ArtifactService:
         """
         # Find the most recent run directory for this model
         model_runs = []
-        for run_dir in self.reports_dir.iterdir():
-            if run_dir.is_dir() and model.replace('_', '') in run_dir.name.lower():
-                model_runs.append(run_dir)
+        for run in iter_runs(self.reports_dir):
+            if model.replace('_', '') in run.name.lower():
+                model_runs.append(run)
         
         if not model_runs:
             return {"history": [], "forecast": [], "metrics": {}}
         
         # Use the most recent run
-        latest_run = max(model_runs, key=lambda p: p.stat().st_mtime)
-        predictions_file = latest_run / "predictions.csv"
-        metrics_file = latest_run / "metrics_seq2seq.csv"
-        
-        if not predictions_file.exists():
-            return {"history": [], "forecast": [], "metrics": {}}
+        latest_run = max(model_runs, key=lambda r: r.mtime)
         
         history = []
         forecast = []
+        metrics = {}
+        coverage = {}
+        found = set()
         
+        # Read all artifacts in one pass so tar archives are decompressed once
         try:
-            with open(predictions_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    row_fold = int(row.get('fold', -1))
-                    if fold_id is not None and row_fold != fold_id:
-                        continue
-                    
-                    timestamp = row.get('timestamp', '')
-                    y_true = row.get('y_true')
-                    y_pred_p10 = row.get('y_pred_p10')
-                    y_pred_p50 = row.get('y_pred_p50')
-                    y_pred_p90 = row.get('y_pred_p90')
-                    horizon_step = int(row.get('horizon_step', 0))
-                    
-                    if y_true and y_true != '':
-                        try:
-                            history.append({
-                                "timestamp": timestamp,
-                                "value": float(y_true)
-                            })
-                        except:
-                            pass
-                    
-                    if y_pred_p50 and y_pred_p50 != '' and horizon_step <= horizon:
-                        try:
-                            forecast.append({
-                                "timestamp": timestamp,
-                                "p10": float(y_pred_p10) if y_pred_p10 else None,
-                                "p50": float(y_pred_p50),
-                                "p90": float(y_pred_p90) if y_pred_p90 else None
-                            })
-                        except:
-                            pass
+            for name, f in latest_run.iter_artifacts(["predictions.csv", "metrics_seq2seq.csv", "folds.json"]):
+                found.add(name)
+                try:
+                    if name == "predictions.csv":
+                        self._read_predictions(f, horizon, fold_id, history, forecast)
+                    elif name == "metrics_seq2seq.csv":
+                        metrics = self._read_metrics(f, horizon, fold_id)
+                    else:
+                        coverage = self._read_coverage(f, fold_id)
+                except Exception as e:
+                    print(f"Error loading {name}: {e}")
         except Exception as e:
-            print(f"Error loading predictions: {e}")
+            print(f"Error reading run {latest_run.name}: {e}")
         
-        # Load metrics
-        metrics = {}
-        if metrics_file.exists():
-            try:
-                with open(metrics_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    mae_per_step = []
-                    rmse_per_step = []
-                    for row in reader:
-                        row_fold = int(row.get('fold', -1))
-                        if fold_id is not None and row_fold != fold_id:
-                            continue
-                        try:
-                            step = int(row.get('horizon_step', 0))
-                            mae = float(row.get('mae', 0))
-                            rmse = float(row.get('rmse', 0))
-                            if step <= horizon:
-                                mae_per_step.append(mae)
-                                rmse_per_step.append(rmse)
-                        except:
-                            pass
-                    metrics = {
-                        "mae_per_step": mae_per_step,
-                        "rmse_per_step": rmse_per_step
-                    }
-            except Exception as e:
-                print(f"Error loading metrics: {e}")
+        if "predictions.csv" not in found:
+            return {"history": [], "forecast": [], "metrics": {}}
         
-        # Load coverage from folds.json
-        folds_file = latest_run / "folds.json"
-        if folds_file.exists():
-            try:
-                with open(folds_file, 'r') as f:
-                    folds_data = json.load(f)
-                    if isinstance(folds_data, dict) and 'folds' in folds_data:
-                        for fold_data in folds_data['folds']:
-                            if fold_data.get('fold') == fold_id:
-                                metrics['coverage_p10'] = 1.0 - fold_data.get('pinball_p10', 0.0)
-                                metrics['coverage_p90'] = fold_data.get('coverage', 0.0)
-                                break
-            except:
-                pass
+        # Archive members can come in any order, so merge coverage last
+        metrics.update(coverage)
         
         return {
             "history": history,
             "forecast": forecast,
             "metrics": metrics
         }
-
+    
+    def _read_predictions(self, f, horizon: int, fold_id: Optional[int], history: List[Dict], forecast: List[Dict]):
+        """Append history and forecast points from a predictions.csv stream."""
+        reader = csv.DictReader(f)
+        for row in reader:
+            row_fold = int(row.get('fold', -1))
+            if fold_id is not None and row_fold != fold_id:
+                continue
+            
+            timestamp = row.get('timestamp', '')
+            y_true = row.get('y_true')
+            y_pred_p10 = row.get('y_pred_p10')
+            y_pred_p50 = row.get('y_pred_p50')
+            y_pred_p90 = row.get('y_pred_p90')
+            horizon_step = int(row.get('horizon_step', 0))
+            
+            if y_true and y_true != '':
+                try:
+                    history.append({
+                        "timestamp": timestamp,
+                        "value": float(y_true)
+                    })
+                except:
+                    pass
+            
+            if y_pred_p50 and y_pred_p50 != '' and horizon_step <= horizon:
+                try:
+                    forecast.append({
+                        "timestamp": timestamp,
+                        "p10": float(y_pred_p10) if y_pred_p10 else None,
+                        "p50": float(y_pred_p50),
+                        "p90": float(y_pred_p90) if y_pred_p90 else None
+                    })
+                except:
+                    pass
+    
+    def _read_metrics(self, f, horizon: int, fold_id: Optional[int]) -> Dict[str, Any]:
+        """Per-step MAE and RMSE from a metrics CSV stream."""
+        reader = csv.DictReader(f)
+        mae_per_step = []
+        rmse_per_step = []
+        for row in reader:
+            row_fold = int(row.get('fold', -1))
+            if fold_id is not None and row_fold != fold_id:
+                continue
+            try:
+                step = int(row.get('horizon_step', 0))
+                mae = float(row.get('mae', 0))
+                rmse = float(row.get('rmse', 0))
+                if step <= horizon:
+                    mae_per_step.append(mae)
+                    rmse_per_step.append(rmse)
+            except:
+                pass
+        return {
+            "mae_per_step": mae_per_step,
+            "rmse_per_step": rmse_per_step
+        }
+    
+    def _read_coverage(self, f, fold_id: Optional[int]) -> Dict[str, Any]:
+        """Coverage of the requested fold from a folds.json stream."""
+        folds_data = json.load(f)
+        if isinstance(folds_data, dict) and 'folds' in folds_data:
+            for fold_data in folds_data['folds']:
+                if fold_data.get('fold') == fold_id:
+                    return {
+                        "coverage_p10": 1.0 - fold_data.get('pinball_p10', 0.0),
+                        "coverage_p90": fold_data.get('coverage', 0.0)
+                    }
+        return {}
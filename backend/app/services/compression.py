@@ -0,0 +1,203 @@
+import gzip
+import io
+import tarfile
+import zipfile
+from contextlib import contextmanager, ExitStack
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+import zstandard
+
+# Decompressed bytes are pulled into the parser in large chunks so that
+# csv/json parsing is not dominated by small read() calls.
+READ_BUFFER_SIZE = 1024 * 1024
+
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar.zst", ".tar", ".zip")
+
+
+def _zstd_reader(raw: IO[bytes]) -> IO[bytes]:
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_size=READ_BUFFER_SIZE)
+
+
+def _decompress(raw: IO[bytes], filename: str, stack: ExitStack) -> IO[bytes]:
+    """Wrap a raw byte stream in a streaming decompressor chosen by file suffix."""
+    if filename.endswith(".gz"):
+        raw = stack.enter_context(gzip.GzipFile(fileobj=raw, mode="rb"))
+    elif filename.endswith(".zst"):
+        raw = stack.enter_context(_zstd_reader(raw))
+    return raw
+
+
+class _ForwardReader(io.RawIOBase):
+    """
+    Forward-only view of a byte stream. Members of tar archives opened in
+    stream mode cannot answer seekable(), which io.TextIOWrapper requires.
+    """
+
+    def __init__(self, raw: IO[bytes]):
+        self._raw = raw
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._raw.readinto(buffer)
+
+
+def _text(raw: IO[bytes], stack: ExitStack) -> IO[str]:
+    buffered = io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+    return stack.enter_context(io.TextIOWrapper(buffered, encoding="utf-8", newline=""))
+
+
+def artifact_names(name: str) -> List[str]:
+    """Candidate file names for an artifact, plain first, then compressed."""
+    return [name] + [name + suffix for suffix in COMPRESSED_SUFFIXES]
+
+
+def is_run_archive(path: Path) -> bool:
+    return path.name.endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def archive_run_name(path: Path) -> str:
+    for suffix in ARCHIVE_SUFFIXES:
+        if path.name.endswith(suffix):
+            return path.name[:-len(suffix)]
+    return path.name
+
+
+@contextmanager
+def open_text(path: Path) -> Iterator[IO[str]]:
+    """
+    Open a (possibly gzip/zstd compressed) artifact as a text stream.
+    Decompression happens incrementally; nothing is unpacked to disk.
+    """
+    with ExitStack() as stack:
+        raw = stack.enter_context(open(path, "rb", buffering=0))
+        yield _text(_decompress(raw, path.name, stack), stack)
+
+
+class RunSource:
+    """
+    Artifacts of a single run, stored either as a reports/<run_id>/ directory
+    or packed into a reports/<run_id>.tar[.gz|.zst] / .zip archive.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.is_archive = not path.is_dir()
+        self.name = archive_run_name(path) if self.is_archive else path.name
+
+    @property
+    def mtime(self) -> float:
+        return self.path.stat().st_mtime
+
+    def find(self, name: str) -> Optional[Path]:
+        """Locate an artifact inside a run directory, trying compressed variants."""
+        for candidate in artifact_names(name):
+            artifact_path = self.path / candidate
+            if artifact_path.exists():
+                return artifact_path
+        return None
+
+    @contextmanager
+    def open(self, name: str) -> Iterator[IO[str]]:
+        """
+        Open an artifact of this run as a text stream.
+        Raises FileNotFoundError if the run has no such artifact.
+        """
+        if not self.is_archive:
+            artifact_path = self.find(name)
+            if artifact_path is None:
+                raise FileNotFoundError(f"{name} not found in {self.path}")
+            with open_text(artifact_path) as f:
+                yield f
+        elif self.path.name.endswith(".zip"):
+            with self._open_zip_member(name) as f:
+                yield f
+        else:
+            with self._open_tar_member(name) as f:
+                yield f
+
+    def iter_artifacts(self, names: List[str]) -> Iterator[Tuple[str, IO[str]]]:
+        """
+        Yield (name, text stream) for each of the named artifacts this run has.
+        Tar archives are decompressed once for all names rather than once per
+        name. Each stream is only valid until the next item is requested.
+        """
+        if self.is_archive and not self.path.name.endswith(".zip"):
+            yield from self._iter_tar_members(names)
+            return
+        for name in names:
+            try:
+                with self.open(name) as f:
+                    yield name, f
+            except FileNotFoundError:
+                continue
+
+    @contextmanager
+    def _open_zip_member(self, name: str) -> Iterator[IO[str]]:
+        candidates = artifact_names(name)
+        with ExitStack() as stack:
+            archive = stack.enter_context(zipfile.ZipFile(self.path))
+            members = {Path(member).name: member for member in archive.namelist()}
+            for candidate in candidates:
+                if candidate in members:
+                    raw = stack.enter_context(archive.open(members[candidate]))
+                    yield _text(_decompress(raw, candidate, stack), stack)
+                    return
+        raise FileNotFoundError(f"{name} not found in {self.path}")
+
+    @contextmanager
+    def _open_tar_member(self, name: str) -> Iterator[IO[str]]:
+        for _, f in self._iter_tar_members([name]):
+            yield f
+            return
+        raise FileNotFoundError(f"{name} not found in {self.path}")
+
+    def _iter_tar_members(self, names: List[str]) -> Iterator[Tuple[str, IO[str]]]:
+        # Tar archives are read in stream mode: members are visited in order
+        # and each match is handed to the parser without seeking back.
+        candidates = {
+            candidate: name for name in names for candidate in artifact_names(name)
+        }
+        found = set()
+        with ExitStack() as stack:
+            raw = stack.enter_context(open(self.path, "rb", buffering=READ_BUFFER_SIZE))
+            # Decompress outside tarfile: its own r|gz reader is about half
+            # as fast as GzipFile feeding an uncompressed tar stream.
+            if self.path.name.endswith(".tgz"):
+                raw = _decompress(raw, ".gz", stack)
+            else:
+                raw = _decompress(raw, self.path.name, stack)
+            archive = stack.enter_context(
+                tarfile.open(fileobj=raw, mode="r|", bufsize=READ_BUFFER_SIZE)
+            )
+            for member in archive:
+                member_name = Path(member.name).name
+                name = candidates.get(member_name)
+                if not member.isfile() or name is None or name in found:
+                    continue
+                found.add(name)
+                with ExitStack() as member_stack:
+                    member_file = _ForwardReader(archive.extractfile(member))
+                    yield name, _text(_decompress(member_file, member_name, member_stack), member_stack)
+                if len(found) == len(names):
+                    return
+
+
+def iter_runs(reports_dir: Path) -> Iterator[RunSource]:
+    """Yield every run in the reports directory, directories and archives alike."""
+    for path in reports_dir.iterdir():
+        if path.is_dir() or is_run_archive(path):
+            yield RunSource(path)
+
+
+def find_run(reports_dir: Path, run_id: str) -> Optional[RunSource]:
+    run_dir = reports_dir / run_id
+    if run_dir.is_dir():
+        return RunSource(run_dir)
+    for suffix in ARCHIVE_SUFFIXES:
+        archive_path = reports_dir / (run_id + suffix)
+        if archive_path.is_file():
+            return RunSource(archive_path)
+    return None
@@ -6,21 +6,31 @@ from pathlib import Path
 from typing import Dict, Any, AsyncGenerator
 from datetime import datetime
 from app.services.artifacts import ArtifactService
+from app.services.admission import AdmissionGate, AdmissionRejected
 
 class RunService:
     """
     Service for managing evaluation runs and streaming logs via SSE.
+    When a run gate is given, at most its max_concurrent runs execute at once
+    and further runs stay queued; start_run raises AdmissionRejected once
+    the queue is full.
     """
     
-    def __init__(self):
+    # Seconds between status checks while a streamed run is queued or finishing
+    status_poll_interval = 1.0
+    
+    def __init__(self, run_gate: AdmissionGate = None):
         self.artifact_service = ArtifactService()
         self.active_runs: Dict[str, Dict[str, Any]] = {}
+        self.run_gate = run_gate
     
     def start_run(self, model: str, horizon: int, fold_id: int = None) -> str:
         """
         Start a background evaluation run.
         Returns run_id for tracking.
         """
+        # Claim a slot before registering the run so a rejected run leaves no trace
+        ticket = self.run_gate.submit() if self.run_gate else None
         run_id = str(uuid.uuid4())
         
         self.active_runs[run_id] = {
@@ -34,11 +44,11 @@ class RunService:
         }
         
         # Start background task
-        asyncio.create_task(self._execute_run(run_id))
+        asyncio.create_task(self._execute_run(run_id, ticket))
         
         return run_id
     
-    async def _execute_run(self, run_id: str):
+    async def _execute_run(self, run_id: str, ticket=None):
         """
         Execute the run in background, updating status and progress.
         In a real implementation, this would call timeseries-forecaster.
@@ -47,6 +57,24 @@ class RunService:
         if not run:
             return
         
+        if ticket is None:
+            await self._simulate_run(run)
+            return
+        
+        # Stay "queued" until the run gate hands over a slot
+        try:
+            await self.run_gate.wait(ticket)
+        except AdmissionRejected as e:
+            run["status"] = "error"
+            run["error"] = e.detail
+            return
+        try:
+            await self._simulate_run(run)
+        finally:
+            self.run_gate.release(ticket)
+    
+    async def _simulate_run(self, run: Dict[str, Any]):
+        run_id = run["run_id"]
         run["status"] = "running"
         
         # Simulate run execution by replaying logs or running actual evaluation
@@ -78,6 +106,22 @@ class RunService:
             "progress": run.get("progress", 0)
         })
         
+        # Hold off the log replay until the run gate hands over a slot
+        while run["status"] == "queued":
+            await asyncio.sleep(self.status_poll_interval)
+            yield json.dumps({
+                "type": "status",
+                "status": run["status"],
+                "progress": run.get("progress", 0)
+            })
+        
+        if run["status"] == "error":
+            yield json.dumps({
+                "type": "error",
+                "message": run.get("error", "Run failed")
+            })
+            return
+        
         # Stream logs (simulate or read from actual log file)
         log_messages = [
             f"Starting evaluation for model={run['model']}, horizon={run['horizon']}",
@@ -89,22 +133,22 @@ class RunService:
             "Evaluation complete!"
         ]
         
-        for i, message in enumerate(log_messages):
+        for message in log_messages:
             await asyncio.sleep(1)
             yield json.dumps({
                 "type": "log",
                 "message": message,
                 "timestamp": datetime.now().isoformat()
             })
-            
-            # Update progress
-            progress = int((i + 1) / len(log_messages) * 100)
-            run["progress"] = progress
             yield json.dumps({
                 "type": "progress",
-                "progress": progress
+                "progress": run.get("progress", 0)
             })
         
+        # Wait for the run itself to finish before reporting completion
+        while run["status"] == "running":
+            await asyncio.sleep(self.status_poll_interval)
+        
         # Send completion
         if run.get("status") == "done":
             yield json.dumps({
@@ -132,6 +176,7 @@ class RunService:
             "model": run.get("model"),
             "horizon": run.get("horizon"),
             "fold_id": run.get("fold_id"),
-            "artifacts": run.get("artifacts")
+            "artifacts": run.get("artifacts"),
+            "error": run.get("error")
         }
 
@@ -0,0 +1,118 @@
+"""
+Benchmark ArtifactService reads of plain, compressed and archived runs.
+
+Usage (from backend/):
+    python -m benchmarks.artifact_io [--rows 1000000] [--repeat 3]
+
+Writes a synthetic run (predictions.csv, metrics_seq2seq.csv, folds.json)
+in each storage format to a temporary reports directory and reports disk
+footprint and predictions.csv parse throughput for each.
+"""
+import argparse
+import gzip
+import io
+import shutil
+import tarfile
+import tempfile
+import time
+import json
+import zipfile
+from pathlib import Path
+
+import zstandard
+
+from app.services.artifacts import ArtifactService
+
+HEADER = "fold,sample,horizon_step,timestamp,y_true,y_pred_p10,y_pred_p50,y_pred_p90\n"
+
+
+def make_predictions(rows: int) -> bytes:
+    lines = [HEADER]
+    for i in range(rows):
+        step = i % 30 + 1
+        value = 100.0 + (i % 97) * 0.37
+        lines.append(
+            f"{i % 5},{i // 30},{step},2024-01-01T00:00:{i % 60:02d},"
+            f"{value:.4f},{value - 4.2:.4f},{value + 0.3:.4f},{value + 4.8:.4f}\n"
+        )
+    return "".join(lines).encode()
+
+
+def make_artifacts(rows: int) -> dict:
+    metrics = ["fold,horizon_step,mae,rmse\n"] + [
+        f"{fold},{step},{1 + step * 0.1:.3f},{1.5 + step * 0.1:.3f}\n"
+        for fold in range(5) for step in range(1, 31)
+    ]
+    folds = {"folds": [{"fold": fold, "coverage": 0.9, "pinball_p10": 0.1} for fold in range(5)]}
+    # predictions.csv first, so archives must be read past it for the rest
+    return {
+        "predictions.csv": make_predictions(rows),
+        "metrics_seq2seq.csv": "".join(metrics).encode(),
+        "folds.json": json.dumps(folds).encode()
+    }
+
+
+def write_run(reports_dir: Path, fmt: str, artifacts: dict) -> int:
+    """Write one run in the given format; return its size on disk in bytes."""
+    run_name = "arima_bench"
+    if fmt in ("plain", "gz", "zst"):
+        run_dir = reports_dir / run_name
+        run_dir.mkdir()
+        for name, data in artifacts.items():
+            if fmt == "gz":
+                (run_dir / (name + ".gz")).write_bytes(gzip.compress(data, compresslevel=6))
+            elif fmt == "zst":
+                (run_dir / (name + ".zst")).write_bytes(zstandard.compress(data, 3))
+            else:
+                (run_dir / name).write_bytes(data)
+    elif fmt == "zip":
+        with zipfile.ZipFile(reports_dir / f"{run_name}.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in artifacts.items():
+                archive.writestr(f"{run_name}/{name}", data)
+    else:
+        tar_buffer = io.BytesIO()
+        with tarfile.open(fileobj=tar_buffer, mode="w") as archive:
+            for name, data in artifacts.items():
+                info = tarfile.TarInfo(f"{run_name}/{name}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        if fmt == "tar.zst":
+            packed = zstandard.compress(tar_buffer.getvalue(), 3)
+        else:
+            packed = gzip.compress(tar_buffer.getvalue(), compresslevel=6)
+        (reports_dir / f"{run_name}.{fmt}").write_bytes(packed)
+    return sum(p.stat().st_size for p in reports_dir.rglob("*") if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    artifacts = make_artifacts(args.rows)
+    data = artifacts["predictions.csv"]
+    formats = ["plain", "gz", "zst", "tar.gz", "tgz", "tar.zst", "zip"]
+
+    print(f"{'format':<10}{'disk MB':>10}{'ratio':>8}{'best s':>10}{'MB/s':>10}")
+    for fmt in formats:
+        reports_dir = Path(tempfile.mkdtemp())
+        try:
+            size = write_run(reports_dir, fmt, artifacts)
+            service = ArtifactService(str(reports_dir))
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = service.load_forecast_data("arima", 30)
+                best = min(best, time.perf_counter() - start)
+            assert result["forecast"] and result["metrics"].get("mae_per_step"), fmt
+            print(
+                f"{fmt:<10}{size / 1e6:>10.1f}{size / len(data):>8.2f}"
+                f"{best:>10.2f}{len(data) / 1e6 / best:>10.1f}"
+            )
+        finally:
+            shutil.rmtree(reports_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.admission import AdmissionGate, AdmissionRejected
+from app.services.runs import RunService
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_gate(max_concurrent=1, max_queue=1, queue_timeout=0.0, rate=0.0, burst=1, service_time=1.0):
+    return AdmissionGate(
+        name="test",
+        max_concurrent=max_concurrent,
+        max_queue=max_queue,
+        queue_timeout=queue_timeout,
+        rate=rate,
+        burst=burst,
+        service_time=service_time
+    )
+
+
+def test_cap_and_queue_full_rejects_with_503():
+    async def scenario():
+        gate = make_gate(max_concurrent=2, max_queue=1, service_time=3.0)
+        first, second = gate.submit(), gate.submit()
+        assert first.future.done() and second.future.done()
+
+        queued = gate.submit()
+        assert not queued.future.done()
+
+        with pytest.raises(AdmissionRejected) as excinfo:
+            gate.submit()
+        assert excinfo.value.status_code == 503
+        # Two waiters' worth of backlog over two slots at the seeded 3 s
+        assert excinfo.value.retry_after == 3
+
+        stats = gate.stats()
+        assert stats["active"] == 2
+        assert stats["queued"] == 1
+        assert stats["rejected"]["queue_full"] == 1
+
+    run(scenario())
+
+
+def test_release_hands_slot_to_waiters_in_order():
+    async def scenario():
+        gate = make_gate(max_concurrent=1, max_queue=2)
+        holder = gate.submit()
+        first, second = gate.submit(), gate.submit()
+
+        gate.release(holder)
+        assert first.future.done() and not second.future.done()
+        gate.release(first)
+        assert second.future.done()
+        gate.release(second)
+
+        assert gate.active == 0
+        assert gate.stats()["admitted"] == 3
+
+    run(scenario())
+
+
+def test_queue_timeout_rejects_with_503_and_records_wait():
+    async def scenario():
+        gate = make_gate(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        holder = gate.submit()
+
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await gate.wait(gate.submit())
+        assert excinfo.value.status_code == 503
+
+        stats = gate.stats()
+        assert stats["queued"] == 0
+        assert stats["rejected"]["queue_timeout"] == 1
+        assert stats["queue_wait_max_s"] >= 0.05
+
+        # The holder's slot is unaffected and frees cleanly
+        gate.release(holder)
+        assert gate.active == 0
+
+    run(scenario())
+
+
+def test_rate_limit_rejects_with_429_and_retry_after():
+    async def scenario():
+        gate = make_gate(max_concurrent=4, max_queue=4, rate=0.5, burst=2)
+        gate.check_rate("client-a")
+        gate.check_rate("client-a")
+
+        with pytest.raises(AdmissionRejected) as excinfo:
+            gate.check_rate("client-a")
+        assert excinfo.value.status_code == 429
+        assert excinfo.value.retry_after == 2
+        assert excinfo.value.to_http().headers == {"Retry-After": "2"}
+
+        # Other clients have their own bucket
+        gate.check_rate("client-b")
+        assert gate.stats()["rejected"]["rate_limited"] == 1
+
+    run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def scenario():
+        gate = make_gate(max_concurrent=1, max_queue=2)
+        holder = gate.submit()
+        waiter = asyncio.create_task(gate.wait(gate.submit()))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert gate.stats()["queued"] == 0
+
+        gate.release(holder)
+        assert gate.active == 0
+
+        # The freed slot is immediately available again
+        ticket = gate.submit()
+        assert ticket.future.done()
+
+    run(scenario())
+
+
+def test_waiter_cancelled_after_handover_passes_slot_on():
+    async def scenario():
+        gate = make_gate(max_concurrent=1, max_queue=2)
+        holder = gate.submit()
+        cancelled = gate.submit()
+        waiter = asyncio.create_task(gate.wait(cancelled))
+        await asyncio.sleep(0)
+        next_ticket = gate.submit()
+
+        # Hand the slot over, then cancel before the waiter resumes
+        gate.release(holder)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert next_ticket.future.done()
+        assert gate.active == 1
+
+    run(scenario())
+
+
+def test_runs_stay_queued_until_a_slot_frees(tmp_path, monkeypatch):
+    monkeypatch.setenv("FORECAST_REPORTS_DIR", str(tmp_path))
+
+    async def scenario():
+        service = RunService(run_gate=make_gate(max_concurrent=1, max_queue=1))
+        finish = {}
+
+        async def controlled_run(run):
+            run["status"] = "running"
+            finish[run["run_id"]] = asyncio.Event()
+            await finish[run["run_id"]].wait()
+            run["status"] = "done"
+
+        service._simulate_run = controlled_run
+
+        first = service.start_run("arima", 7)
+        second = service.start_run("arima", 7)
+        with pytest.raises(AdmissionRejected):
+            service.start_run("arima", 7)
+
+        await asyncio.sleep(0.01)
+        assert service.get_run_status(first)["status"] == "running"
+        assert service.get_run_status(second)["status"] == "queued"
+
+        finish[first].set()
+        await asyncio.sleep(0.01)
+        assert service.get_run_status(first)["status"] == "done"
+        assert service.get_run_status(second)["status"] == "running"
+
+        finish[second].set()
+        await asyncio.sleep(0.01)
+        assert service.run_gate.active == 0
+
+    run(scenario())
+
+
+def test_stream_reports_queue_timeout_as_error(tmp_path, monkeypatch):
+    monkeypatch.setenv("FORECAST_REPORTS_DIR", str(tmp_path))
+
+    async def scenario():
+        service = RunService(run_gate=make_gate(max_concurrent=1, max_queue=1, queue_timeout=0.05))
+        service.status_poll_interval = 0.01
+        service.start_run("arima", 7)
+        queued = service.start_run("arima", 7)
+
+        events = [json.loads(event) async for event in service.stream_run(queued)]
+
+        assert events[0] == {"type": "status", "status": "queued", "progress": 0}
+        assert events[-1]["type"] == "error"
+        assert not any(event["type"] == "log" for event in events)
+        assert service.get_run_status(queued)["status"] == "error"
+
+    run(scenario())
@@ -0,0 +1,183 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+import zstandard
+
+from app.services import compression
+from app.services.artifacts import ArtifactService
+from app.services.compression import RunSource, find_run, iter_runs
+
+PREDICTIONS = "fold,sample,horizon_step,timestamp,y_true,y_pred_p10,y_pred_p50,y_pred_p90\n" + "".join(
+    f"{fold},0,{step},2024-01-{step:02d},{step}.0,{step - 1}.0,{step}.5,{step + 1}.0\n"
+    for fold in range(3) for step in range(1, 10)
+)
+METRICS = "fold,horizon_step,mae,rmse\n" + "".join(
+    f"{fold},{step},{step * 0.1:.1f},{step * 0.2:.1f}\n"
+    for fold in range(3) for step in range(1, 10)
+)
+FOLDS = json.dumps({"folds": [
+    {"fold": 1, "coverage": 0.9, "pinball_p10": 0.2},
+    {"fold": 4, "coverage": 0.8, "pinball_p10": 0.1}
+]})
+REPORT = json.dumps({"run": "arima_1"})
+
+ARTIFACTS = {
+    "predictions.csv": PREDICTIONS,
+    "metrics_seq2seq.csv": METRICS,
+    "folds.json": FOLDS,
+    "report.json": REPORT
+}
+
+
+def compress(name, text, codec):
+    data = text.encode()
+    if codec == "gz":
+        return name + ".gz", gzip.compress(data)
+    if codec == "zst":
+        return name + ".zst", zstandard.compress(data)
+    return name, data
+
+
+def write_dir_run(reports_dir, codec):
+    run_dir = reports_dir / "arima_1"
+    run_dir.mkdir()
+    for name, text in ARTIFACTS.items():
+        filename, data = compress(name, text, codec)
+        (run_dir / filename).write_bytes(data)
+
+
+def write_archive_run(reports_dir, fmt, member_codec=None):
+    members = [compress(name, text, member_codec) for name, text in ARTIFACTS.items()]
+    if fmt == "zip":
+        with zipfile.ZipFile(reports_dir / "arima_1.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+            for filename, data in members:
+                archive.writestr(f"arima_1/{filename}", data)
+        return
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for filename, data in members:
+            info = tarfile.TarInfo(f"arima_1/{filename}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    packed = buffer.getvalue()
+    if fmt in ("tar.gz", "tgz"):
+        packed = gzip.compress(packed)
+    elif fmt == "tar.zst":
+        packed = zstandard.compress(packed)
+    (reports_dir / f"arima_1.{fmt}").write_bytes(packed)
+
+
+def load(reports_dir):
+    service = ArtifactService(str(reports_dir))
+    return (
+        service.load_forecast_data("arima", 7, 1),
+        service.get_available_folds(),
+        service.load_report(),
+        service.load_report("arima_1")
+    )
+
+
+@pytest.fixture
+def expected(tmp_path):
+    reports_dir = tmp_path / "plain"
+    reports_dir.mkdir()
+    write_dir_run(reports_dir, None)
+    return load(reports_dir)
+
+
+def test_plain_layout_loads_everything(expected):
+    forecast_data, folds, latest_report, report = expected
+    assert len(forecast_data["history"]) == 9
+    assert len(forecast_data["forecast"]) == 7
+    assert forecast_data["metrics"]["mae_per_step"] == [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
+    assert forecast_data["metrics"]["coverage_p10"] == pytest.approx(0.8)
+    assert folds == [0, 1, 2, 4]
+    assert latest_report == report == {"run": "arima_1"}
+
+
+@pytest.mark.parametrize("codec", ["gz", "zst"])
+def test_compressed_artifacts_match_plain(tmp_path, expected, codec):
+    write_dir_run(tmp_path, codec)
+    assert load(tmp_path) == expected
+
+
+@pytest.mark.parametrize("fmt", ["tar", "tar.gz", "tgz", "tar.zst", "zip"])
+@pytest.mark.parametrize("member_codec", [None, "gz", "zst"])
+def test_archived_runs_match_plain(tmp_path, expected, fmt, member_codec):
+    write_archive_run(tmp_path, fmt, member_codec)
+    assert load(tmp_path) == expected
+
+
+def test_tar_artifacts_are_read_in_one_pass(tmp_path, monkeypatch):
+    write_archive_run(tmp_path, "tar.zst")
+    opened = []
+    real_open = compression.tarfile.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(kwargs.get("mode"))
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(compression.tarfile, "open", counting_open)
+    run = RunSource(tmp_path / "arima_1.tar.zst")
+    names = [name for name, f in run.iter_artifacts(["folds.json", "missing.csv", "predictions.csv"])]
+
+    assert sorted(names) == ["folds.json", "predictions.csv"]
+    assert opened == ["r|"]
+
+    opened.clear()
+    ArtifactService(str(tmp_path)).load_forecast_data("arima", 7, 1)
+    assert len(opened) == 1
+
+
+def test_missing_member_raises_file_not_found(tmp_path):
+    write_archive_run(tmp_path, "tar.gz")
+    with pytest.raises(FileNotFoundError):
+        with RunSource(tmp_path / "arima_1.tar.gz").open("missing.csv"):
+            pass
+
+
+def test_find_run_prefers_directory_then_archives(tmp_path):
+    write_archive_run(tmp_path, "zip")
+    assert find_run(tmp_path, "arima_1").path == tmp_path / "arima_1.zip"
+    assert find_run(tmp_path, "arima_1").name == "arima_1"
+    assert find_run(tmp_path, "missing") is None
+
+    write_dir_run(tmp_path, None)
+    assert find_run(tmp_path, "arima_1").path == tmp_path / "arima_1"
+    assert sorted(run.path.name for run in iter_runs(tmp_path)) == ["arima_1", "arima_1.zip"]
+
+
+def test_latest_report_skips_newer_runs_without_one(tmp_path):
+    write_dir_run(tmp_path, "gz")
+    os.utime(tmp_path / "arima_1", (1, 1))
+    (tmp_path / "arima_2").mkdir()
+    (tmp_path / "arima_2" / "predictions.csv").write_text(PREDICTIONS)
+
+    assert ArtifactService(str(tmp_path)).load_report() == {"run": "arima_1"}
+
+
+def test_fold_scan_finds_nested_artifacts(tmp_path):
+    nested = tmp_path / "experiments" / "arima_1"
+    nested.mkdir(parents=True)
+    (nested / "folds.json.gz").write_bytes(gzip.compress(FOLDS.encode()))
+    write_archive_run(tmp_path / "experiments", "tar.zst")
+
+    assert ArtifactService(str(tmp_path)).get_available_folds() == [0, 1, 2, 4]
+
+
+def test_fold_cache_sees_in_place_writes(tmp_path):
+    run_dir = tmp_path / "arima_1"
+    run_dir.mkdir()
+    predictions = run_dir / "predictions.csv"
+    predictions.write_text("fold,y_true\n0,1.0\n")
+    service = ArtifactService(str(tmp_path))
+    assert service.get_available_folds() == [0]
+
+    with open(predictions, "a") as f:
+        f.write("1,1.0\n2,1.0\n")
+    assert service.get_available_folds() == [0, 1, 2]
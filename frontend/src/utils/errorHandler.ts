@@ -2,6 +2,7 @@ export interface AppError {
   message: string;
   code?: string;
   retryable?: boolean;
+  retryAfterMs?: number;
 }
 
 export class APIError extends Error {
@@ -16,6 +17,19 @@ export class APIError extends Error {
   }
 }
 
+// Retry-After is either a number of seconds or an HTTP date
+const parseRetryAfter = (value?: string): number | undefined => {
+  if (!value) {
+    return undefined;
+  }
+  const seconds = Number(value);
+  if (!Number.isNaN(seconds)) {
+    return Math.max(0, seconds * 1000);
+  }
+  const date = Date.parse(value);
+  return Number.isNaN(date) ? undefined : Math.max(0, date - Date.now());
+};
+
 export const handleError = (error: any): AppError => {
   if (error.response) {
     // API responded with error status
@@ -25,7 +39,9 @@ export const handleError = (error: any): AppError => {
     return {
       message,
       code: `HTTP_${status}`,
-      retryable: status >= 500 || status === 408, // Server errors and timeout are retryable
+      // Server errors, timeouts and rate limiting (429) are retryable
+      retryable: status >= 500 || status === 408 || status === 429,
+      retryAfterMs: parseRetryAfter(error.response.headers?.['retry-after']),
     };
   } else if (error.request) {
     // Request made but no response received
@@ -62,8 +78,10 @@ export const retryRequest = async <T>(
         throw error;
       }
 
-      // Exponential backoff
-      await new Promise((resolve) => setTimeout(resolve, delay * Math.pow(2, i)));
+      // Exponential backoff, but never sooner than the server's Retry-After
+      const backoff = delay * Math.pow(2, i);
+      const wait = Math.max(backoff, appError.retryAfterMs ?? 0);
+      await new Promise((resolve) => setTimeout(resolve, wait));
     }
   }
 